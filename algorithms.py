@@ -17,10 +17,11 @@ See the 'Arrival generation algorithms' and 'Elevator moving algorithsm'
 sections of the assignment handout for a complete description of each algorithm
 you are expected to implement in this file.
 """
+from bisect import bisect_left, bisect_right
 import csv
 from enum import Enum
 import random
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from entities import Person, Elevator
 
@@ -77,12 +78,55 @@ class RandomArrivals(ArrivalGenerator):
 
     Hint: look up the 'sample' function from random.
     """
-    pass
+    def generate(self, round_num: int) -> Dict[int, List[Person]]:
+        """Return the new arrivals for the simulation at the given round.
+
+        Each person's start and target floors are chosen at random, and are
+        always different from each other.
+        """
+        if self.num_people is None:
+            return {}
+
+        arrivals = {}
+        for _ in range(self.num_people):
+            start, target = random.sample(range(1, self.max_floor + 1), 2)
+            arrivals.setdefault(start, []).append(Person(start, target))
+        return arrivals
+
+
+def read_arrivals(filename: str) -> Dict[int, List[Tuple[int, int]]]:
+    """Return the arrivals listed in the CSV file <filename>.
+
+    The returned dictionary maps each round number to the (start, target)
+    floors of the people arriving in that round, in the order they appear in
+    the file.
+
+    Precondition:
+        <filename> refers to a valid CSV file, following the specified
+        format and restrictions from the assignment handout.
+    """
+    arrivals = {}
+    with open(filename) as csvfile:
+        reader = csv.reader(csvfile)
+        for line in reader:
+            values = [int(value) for value in line]
+            pairs = arrivals.setdefault(values[0], [])
+            for i in range(1, len(values) - 1, 2):
+                pairs.append((values[i], values[i + 1]))
+    return arrivals
 
 
 class FileArrivals(ArrivalGenerator):
     """Generate arrivals from a CSV file.
+
+    Each line of the file contains a round number followed by one or more
+    (start floor, target floor) pairs for the people arriving in that round.
     """
+    # === Private Attributes ===
+    # _arrivals: maps a round number to the (start, target) floors of the
+    #            people who arrive in that round
+    _arrivals: Dict[int, List[Tuple[int, int]]]
+
     def __init__(self, max_floor: int, filename: str) -> None:
         """Initialize a new FileArrivals algorithm from the given file.
 
@@ -94,17 +138,14 @@ class FileArrivals(ArrivalGenerator):
             format and restrictions from the assignment handout.
         """
         ArrivalGenerator.__init__(self, max_floor, None)
+        self._arrivals = read_arrivals(filename)
 
-        # We've provided some of the "reading from csv files" boilerplate code
-        # for you to help you get started.
-        with open(filename) as csvfile:
-            reader = csv.reader(csvfile)
-            for line in reader:
-                # TODO: complete this. <line> is a list of strings corresponding
-                # to one line of the original file.
-                # You'll need to convert the strings to ints and then process
-                # and store them.
-                pass
+    def generate(self, round_num: int) -> Dict[int, List[Person]]:
+        """Return the people listed in the file for the given round."""
+        arrivals = {}
+        for start, target in self._arrivals.get(round_num, []):
+            arrivals.setdefault(start, []).append(Person(start, target))
+        return arrivals
 
 
 ###############################################################################
@@ -143,13 +184,157 @@ class MovingAlgorithm:
         raise NotImplementedError
 
 
+def _direction_to(current: int, target: int) -> Direction:
+    """Return the direction to move from floor <current> towards <target>."""
+    if target > current:
+        return Direction.UP
+    elif target < current:
+        return Direction.DOWN
+    else:
+        return Direction.STAY
+
+
+class FloorTable:
+    """Precomputed distances and directions between the floors of a building.
+
+    Both tables are indexed by floor number, so row and column 0 are unused.
+
+    === Attributes ===
+    max_floor: the maximum floor number of the building
+    distance: distance[a][b] is the number of floors between floors a and b
+    direction: direction[a][b] is the direction to move from floor a towards
+               floor b
+
+    === Representation Invariants ===
+    max_floor >= 1
+    len(distance) == len(direction) == max_floor + 1
+    """
+    max_floor: int
+    distance: List[List[int]]
+    direction: List[List[Direction]]
+
+    def __init__(self, max_floor: int) -> None:
+        """Initialize the tables for a building with floors 1 to max_floor.
+
+        Precondition: max_floor >= 1
+        """
+        floors = range(max_floor + 1)
+        self.max_floor = max_floor
+        self.distance = [[abs(a - b) for b in floors] for a in floors]
+        self.direction = [[_direction_to(a, b) for b in floors]
+                          for a in floors]
+
+    def closest(self, current: int, floors: Sequence[int]) -> int:
+        """Return the floor in <floors> closest to <current>.
+
+        Ties are broken in favour of the lower floor.
+
+        Precondition: floors is not empty
+        """
+        row = self.distance[current]
+        return min(floors, key=lambda floor: (row[floor], floor))
+
+
+# The floor table for each building size that has been used so far.
+_FLOOR_TABLES: Dict[int, FloorTable] = {}
+
+
+def floor_table(max_floor: int) -> FloorTable:
+    """Return the floor table for a building with floors 1 to max_floor.
+
+    Each table is built once and shared by every algorithm that asks for it.
+
+    Precondition: max_floor >= 1
+    """
+    if max_floor not in _FLOOR_TABLES:
+        _FLOOR_TABLES[max_floor] = FloorTable(max_floor)
+    return _FLOOR_TABLES[max_floor]
+
+
 class RandomAlgorithm(MovingAlgorithm):
     """A moving algorithm that picks a random direction for each elevator.
     """
-    pass
+    def move_elevators(self,
+                       elevators: List[Elevator],
+                       waiting: Dict[int, List[Person]],
+                       max_floor: int) -> List[Direction]:
+        """Return a random valid direction for each elevator."""
+        directions = []
+        for elevator in elevators:
+            choices = [Direction.STAY]
+            if elevator.current_floor < max_floor:
+                choices.append(Direction.UP)
+            if elevator.current_floor > 1:
+                choices.append(Direction.DOWN)
+            directions.append(random.choice(choices))
+        return directions
+
+
+class _TargetAlgorithm(MovingAlgorithm):
+    """A moving algorithm that moves each elevator towards one target floor.
+
+    The target comes from the elevator's passengers if it has any, or from
+    the floors where people are waiting if it is empty. Subclasses decide how
+    the target is chosen in each case.
+
+    The targets for empty elevators are computed for every floor at once, and
+    only recomputed when the set of floors with people waiting changes.
+    """
+    # === Private Attributes ===
+    # _waiting_floors: the floors that had people waiting in the last round,
+    #                  in increasing order, or None before the first round
+    # _empty_targets: _empty_targets[floor] is the target for an empty
+    #                 elevator on that floor, given _waiting_floors
+    _waiting_floors: Optional[Tuple[int, ...]]
+    _empty_targets: List[int]
+
+    def __init__(self) -> None:
+        """Initialize this algorithm with nothing cached."""
+        self._waiting_floors = None
+        self._empty_targets = []
+
+    def move_elevators(self,
+                       elevators: List[Elevator],
+                       waiting: Dict[int, List[Person]],
+                       max_floor: int) -> List[Direction]:
+        """Return the direction chosen for each elevator."""
+        table = floor_table(max_floor)
+        waiting_floors = tuple(sorted(floor for floor, people in waiting.items()
+                                      if people))
+        if (waiting_floors != self._waiting_floors or
+                len(self._empty_targets) != max_floor + 1):
+            self._waiting_floors = waiting_floors
+            self._empty_targets = self._targets_when_empty(table,
+                                                           waiting_floors)
+
+        directions = []
+        for elevator in elevators:
+            floor = elevator.current_floor
+            if elevator.passengers:
+                target = self._passenger_target(table, elevator)
+            else:
+                target = self._empty_targets[floor]
+            directions.append(table.direction[floor][target])
+        return directions
+
+    def _passenger_target(self, table: FloorTable, elevator: Elevator) -> int:
+        """Return the target floor for <elevator>, based on its passengers.
+
+        Precondition: elevator.passengers != []
+        """
+        raise NotImplementedError
+
+    def _targets_when_empty(self, table: FloorTable,
+                            waiting_floors: Tuple[int, ...]) -> List[int]:
+        """Return a list whose element at each floor is the target for an
+        empty elevator on that floor.
+
+        Element 0 of the returned list is unused.
+        """
+        raise NotImplementedError
 
 
-class PushyPassenger(MovingAlgorithm):
+class PushyPassenger(_TargetAlgorithm):
     """A moving algorithm that preferences the first passenger on each elevator.
 
     If the elevator is empty, it moves towards the *lowest* floor that has at
@@ -158,10 +343,22 @@ class PushyPassenger(MovingAlgorithm):
     If the elevator isn't empty, it moves towards the target floor of the
     *first* passenger who boarded the elevator.
     """
-    pass
+    def _passenger_target(self, table: FloorTable, elevator: Elevator) -> int:
+        """Return the target floor of the first passenger of <elevator>."""
+        return elevator.passengers[0].target
+
+    def _targets_when_empty(self, table: FloorTable,
+                            waiting_floors: Tuple[int, ...]) -> List[int]:
+        """Return the lowest waiting floor for every floor, or the floor
+        itself if nobody is waiting.
+        """
+        floors = range(table.max_floor + 1)
+        if not waiting_floors:
+            return list(floors)
+        return [waiting_floors[0] for _ in floors]
 
 
-class ShortSighted(MovingAlgorithm):
+class ShortSighted(_TargetAlgorithm):
     """A moving algorithm that preferences the closest possible choice.
 
     If the elevator is empty, it moves towards the *closest* floor that has at
@@ -171,16 +368,294 @@ class ShortSighted(MovingAlgorithm):
     all passengers who are on the elevator.
 
     In this case, the order in which people boarded does *not* matter.
+
+    Ties between equally close floors go to the lower floor.
+    """
+    # === Private Attributes ===
+    # _targets: maps each elevator to the passengers and floor its last
+    #           passenger target was chosen from, and that target
+    _targets: Dict[Elevator, Tuple[Tuple[Person, ...], int, int]]
+
+    def __init__(self) -> None:
+        """Initialize this algorithm with nothing cached."""
+        _TargetAlgorithm.__init__(self)
+        self._targets = {}
+
+    def _passenger_target(self, table: FloorTable, elevator: Elevator) -> int:
+        """Return the passenger target floor closest to <elevator>.
+
+        The last target chosen for <elevator> is reused until its passengers
+        change, or it leaves the floors between where that target was chosen
+        and the target itself. Moving towards the closest target brings it
+        closer than every other passenger's target, so it stays the closest.
+        """
+        passengers = tuple(elevator.passengers)
+        floor = elevator.current_floor
+        cached = self._targets.get(elevator)
+        if cached is not None:
+            cached_passengers, chosen_at, target = cached
+            if (cached_passengers == passengers and
+                    min(chosen_at, target) <= floor <= max(chosen_at, target)):
+                return target
+
+        target = table.closest(floor,
+                               [person.target for person in passengers])
+        self._targets[elevator] = (passengers, floor, target)
+        return target
+
+    def _targets_when_empty(self, table: FloorTable,
+                            waiting_floors: Tuple[int, ...]) -> List[int]:
+        """Return the closest waiting floor to every floor, or the floor
+        itself if nobody is waiting.
+        """
+        floors = range(table.max_floor + 1)
+        if not waiting_floors:
+            return list(floors)
+
+        targets = []
+        for floor in floors:
+            # The closest waiting floor is one of the two around this floor.
+            i = bisect_left(waiting_floors, floor)
+            around = waiting_floors[max(i - 1, 0):i + 1]
+            targets.append(table.closest(floor, around))
+        return targets
+
+
+###############################################################################
+# Elevator travel model
+###############################################################################
+class TravelModel:
+    """A model of how far elevators travel in a round.
+
+    An elevator moving in the same direction as in the previous round speeds
+    up by the acceleration, up to the maximum speed; one that starts moving
+    or changes direction starts again from rest. The speed it reaches is how
+    far it can go this round, rounded down to a whole number of floors but
+    always at least one floor.
+
+    The elevator stops early at the first floor on its way where a passenger
+    wants to get off, or where people are waiting if it has room for them.
+    Stopping takes no extra time, and an elevator that stops is at rest at
+    the start of the next round. With the default speed and acceleration,
+    every elevator moves exactly one floor per round.
+
+    === Attributes ===
+    floor_height: the height of each floor, in metres
+    max_speed: the fastest an elevator can go, in metres per round
+    acceleration: how much faster an elevator gets each round, in metres per
+                  round per round
+
+    === Representation Invariants ===
+    floor_height > 0
+    max_speed > 0
+    acceleration > 0
+    """
+    floor_height: float
+    max_speed: float
+    acceleration: float
+
+    def __init__(self, floor_height: float,
+                 max_speed: Optional[float] = None,
+                 acceleration: Optional[float] = None) -> None:
+        """Initialize a new travel model.
+
+        <max_speed> defaults to one floor per round, and <acceleration>
+        defaults to <max_speed>, so that elevators reach full speed after one
+        round.
+
+        Preconditions:
+            floor_height > 0
+            max_speed is None or max_speed > 0
+            acceleration is None or acceleration > 0
+        """
+        self.floor_height = floor_height
+        self.max_speed = floor_height if max_speed is None else max_speed
+        self.acceleration = (self.max_speed if acceleration is None
+                             else acceleration)
+
+    def travel(self, elevator: Elevator, direction: Direction,
+               waiting_floors: List[int], max_floor: int) -> int:
+        """Move <elevator> in <direction> for one round, and return the number
+        of floors it moved.
+
+        <waiting_floors> are the floors where people are waiting, in
+        increasing order. The floors passed along the way are never visited
+        one at a time; the first stop is found directly from the passengers'
+        targets and <waiting_floors>.
+
+        Precondition: <direction> is valid for <elevator> in a building with
+        floors 1 to <max_floor>.
+        """
+        step = direction.value
+        floor = elevator.current_floor
+        if step == 0:
+            elevator.velocity = 0.0
+            return 0
+
+        speed = abs(elevator.velocity) if elevator.velocity * step > 0 else 0.0
+        speed = min(speed + self.acceleration, self.max_speed)
+        reach = max(1, int(speed // self.floor_height))
+        if step > 0:
+            limit = min(floor + reach, max_floor)
+        else:
+            limit = max(floor - reach, 1)
+
+        stop = _next_stop(elevator, step, limit, waiting_floors)
+        if stop is not None:
+            elevator.current_floor = stop
+            elevator.velocity = 0.0
+        else:
+            elevator.current_floor = limit
+            if limit in (1, max_floor):
+                elevator.velocity = 0.0
+            else:
+                elevator.velocity = step * speed
+        return abs(elevator.current_floor - floor)
+
+
+def _next_stop(elevator: Elevator, step: int, limit: int,
+               waiting_floors: List[int]) -> Optional[int]:
+    """Return the first floor after the current floor of <elevator>, in the
+    direction of <step> and no further than <limit>, where the elevator needs
+    to stop. Return None if there is no such floor.
+
+    <waiting_floors> are the floors where people are waiting, in increasing
+    order.
+    """
+    floor = elevator.current_floor
+    low, high = (floor + 1, limit) if step > 0 else (limit, floor - 1)
+    stops = [person.target for person in elevator.passengers
+             if low <= person.target <= high]
+    if not elevator.is_full():
+        if step > 0:
+            i = bisect_left(waiting_floors, low)
+            if i < len(waiting_floors) and waiting_floors[i] <= high:
+                stops.append(waiting_floors[i])
+        else:
+            i = bisect_right(waiting_floors, high) - 1
+            if i >= 0 and waiting_floors[i] >= low:
+                stops.append(waiting_floors[i])
+
+    if not stops:
+        return None
+    return min(stops) if step > 0 else max(stops)
+
+
+# A summary of one elevator's situation, used by LearnedPolicy. See
+# elevator_states for what each element means.
+State = Tuple[int, int, int, int]
+
+# The possible values of each element of a State, in order.
+STATE_VALUES = [(-1, 0, 1, 2), (-1, 0, 1, 2), (-1, 0, 1), (0, 1)]
+
+
+def elevator_states(elevators: List[Elevator],
+                    waiting: Dict[int, List[Person]],
+                    max_floor: int) -> List[State]:
+    """Return the state of each elevator, given the people waiting.
+
+    The state of an elevator is a tuple of four ints:
+        - the direction value towards its closest passenger target, or 2 if
+          it has no passengers
+        - the direction value towards the closest floor with people waiting,
+          or 2 if nobody is waiting anywhere
+        - 1 if more people are waiting above it than below it, -1 if more
+          are waiting below it, and 0 otherwise
+        - 1 if it is full, and 0 otherwise
     """
-    pass
+    table = floor_table(max_floor)
+    waiting_floors = sorted(floor for floor, people in waiting.items()
+                            if people)
+    # at_or_below[floor] is the number of people waiting on floors 1..floor.
+    at_or_below = [0] * (max_floor + 1)
+    for floor in range(1, max_floor + 1):
+        at_or_below[floor] = (at_or_below[floor - 1] +
+                              len(waiting.get(floor, [])))
+    total = at_or_below[max_floor]
+
+    states = []
+    for elevator in elevators:
+        floor = elevator.current_floor
+        if elevator.passengers:
+            target = table.closest(floor, [person.target
+                                           for person in elevator.passengers])
+            passenger = table.direction[floor][target].value
+        else:
+            passenger = 2
+
+        if waiting_floors:
+            i = bisect_left(waiting_floors, floor)
+            target = table.closest(floor, waiting_floors[max(i - 1, 0):i + 1])
+            nearest = table.direction[floor][target].value
+        else:
+            nearest = 2
+
+        above = total - at_or_below[floor]
+        below = at_or_below[floor - 1]
+        balance = (above > below) - (above < below)
+        states.append((passenger, nearest, balance, int(elevator.is_full())))
+    return states
+
+
+def default_action(state: State) -> Direction:
+    """Return the direction to move in for a state missing from a policy
+    table: towards the closest passenger target, or else towards the closest
+    waiting floor.
+    """
+    passenger, nearest = state[0], state[1]
+    if passenger != 2:
+        return Direction(passenger)
+    elif nearest != 2:
+        return Direction(nearest)
+    else:
+        return Direction.STAY
+
+
+class LearnedPolicy(MovingAlgorithm):
+    """A moving algorithm that looks up each elevator's move in a table.
+
+    The table maps the state of an elevator (see elevator_states) to the
+    direction it should move in. Tables are fitted offline by simulating many
+    episodes with training.py, so making a decision is just a lookup.
+
+    States missing from the table use default_action. A move that would take
+    an elevator past the bottom or top floor is replaced by Direction.STAY.
+
+    === Attributes ===
+    table: maps an elevator state to the direction to move in
+    """
+    table: Dict[State, Direction]
+
+    def __init__(self, table: Dict[State, Direction]) -> None:
+        """Initialize a new policy that follows <table>."""
+        self.table = table
+
+    def move_elevators(self,
+                       elevators: List[Elevator],
+                       waiting: Dict[int, List[Person]],
+                       max_floor: int) -> List[Direction]:
+        """Return the direction in self.table for each elevator's state."""
+        directions = []
+        states = elevator_states(elevators, waiting, max_floor)
+        for elevator, state in zip(elevators, states):
+            direction = self.table.get(state)
+            if direction is None:
+                direction = default_action(state)
+            if ((direction == Direction.UP and
+                 elevator.current_floor == max_floor) or
+                    (direction == Direction.DOWN and
+                     elevator.current_floor == 1)):
+                direction = Direction.STAY
+            directions.append(direction)
+        return directions
 
 
 if __name__ == '__main__':
     # Don't forget to check your work regularly with python_ta!
     import python_ta
     python_ta.check_all(config={
-        'allowed-io': ['__init__'],
-        'extra-imports': ['entities', 'random', 'csv', 'enum'],
+        'allowed-io': ['__init__', 'read_arrivals'],
+        'extra-imports': ['entities', 'random', 'csv', 'enum', 'bisect'],
         'max-nested-blocks': 4,
         'disable': ['R0201']
     })
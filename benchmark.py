@@ -0,0 +1,327 @@
+"""CSC148 Assignment 1 - Benchmarks
+
+=== CSC148 Fall 2018 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module description ===
+This module contains timing benchmarks for parts of the simulation that get
+slow in large or congested buildings. Each benchmark runs without the
+visualizer and prints its timings.
+
+It also contains check_moving, which checks that the cached decisions of
+PushyPassenger and ShortSighted match direct implementations of the same
+rules. Run this file directly to run the check and all of the benchmarks.
+"""
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import algorithms
+from entities import Elevator, Person, RoundClock, WaitHistogram
+from simulation import Simulation
+from visualizer import Visualizer
+
+
+class _Crowd(algorithms.ArrivalGenerator):
+    """Generate all of num_people at once in round 0, on random floors."""
+    def generate(self, round_num: int) -> Dict[int, List[Person]]:
+        """Return everyone in round 0, and nobody afterwards."""
+        if round_num != 0:
+            return {}
+        arrivals = {}
+        for _ in range(self.num_people):
+            start, target = random.sample(range(1, self.max_floor + 1), 2)
+            arrivals.setdefault(start, []).append(Person(start, target))
+        return arrivals
+
+
+def _reference_direction(current: int, target: int) -> algorithms.Direction:
+    """Return the direction from floor <current> towards <target>."""
+    if target > current:
+        return algorithms.Direction.UP
+    elif target < current:
+        return algorithms.Direction.DOWN
+    else:
+        return algorithms.Direction.STAY
+
+
+class _ReferencePushy(algorithms.MovingAlgorithm):
+    """PushyPassenger, computed from scratch every round with no caching or
+    lookup tables.
+    """
+    def move_elevators(self,
+                       elevators: List[Elevator],
+                       waiting: Dict[int, List[Person]],
+                       max_floor: int) -> List[algorithms.Direction]:
+        """Return the direction chosen for each elevator."""
+        waiting_floors = [floor for floor, people in waiting.items() if people]
+        directions = []
+        for elevator in elevators:
+            if elevator.passengers:
+                target = elevator.passengers[0].target
+            elif waiting_floors:
+                target = min(waiting_floors)
+            else:
+                target = elevator.current_floor
+            directions.append(_reference_direction(elevator.current_floor,
+                                                   target))
+        return directions
+
+
+class _ReferenceShortSighted(algorithms.MovingAlgorithm):
+    """ShortSighted, computed from scratch every round with no caching or
+    lookup tables.
+    """
+    def move_elevators(self,
+                       elevators: List[Elevator],
+                       waiting: Dict[int, List[Person]],
+                       max_floor: int) -> List[algorithms.Direction]:
+        """Return the direction chosen for each elevator."""
+        waiting_floors = [floor for floor, people in waiting.items() if people]
+        directions = []
+        for elevator in elevators:
+            current = elevator.current_floor
+            if elevator.passengers:
+                floors = [person.target for person in elevator.passengers]
+            else:
+                floors = waiting_floors
+            if floors:
+                target = min(floors,
+                             key=lambda floor: (abs(floor - current), floor))
+            else:
+                target = current
+            directions.append(_reference_direction(current, target))
+        return directions
+
+
+# Each cached moving algorithm, paired with its reference implementation.
+_REFERENCES = [(algorithms.PushyPassenger, _ReferencePushy),
+               (algorithms.ShortSighted, _ReferenceShortSighted)]
+
+
+class _TimedMoves(algorithms.MovingAlgorithm):
+    """A moving algorithm that times each call to another moving algorithm.
+    """
+    algorithm: algorithms.MovingAlgorithm
+    times: List[float]
+
+    def __init__(self, algorithm: algorithms.MovingAlgorithm) -> None:
+        """Initialize a timer for <algorithm>."""
+        self.algorithm = algorithm
+        self.times = []
+
+    def move_elevators(self,
+                       elevators: List[Elevator],
+                       waiting: Dict[int, List[Person]],
+                       max_floor: int) -> List[algorithms.Direction]:
+        """Return the directions chosen by the wrapped algorithm."""
+        start = time.perf_counter()
+        directions = self.algorithm.move_elevators(elevators, waiting,
+                                                   max_floor)
+        self.times.append(time.perf_counter() - start)
+        return directions
+
+
+class _ComparedMoves(algorithms.MovingAlgorithm):
+    """A moving algorithm that checks that one algorithm makes the same
+    decisions as a reference algorithm every round.
+
+    The elevators follow driver if it is not None, and algorithm otherwise.
+    """
+    algorithm: algorithms.MovingAlgorithm
+    reference: algorithms.MovingAlgorithm
+    driver: Optional[algorithms.MovingAlgorithm]
+    rounds: int
+
+    def __init__(self, algorithm: algorithms.MovingAlgorithm,
+                 reference: algorithms.MovingAlgorithm,
+                 driver: Optional[algorithms.MovingAlgorithm] = None) -> None:
+        """Initialize a comparison of <algorithm> with <reference>."""
+        self.algorithm = algorithm
+        self.reference = reference
+        self.driver = driver
+        self.rounds = 0
+
+    def move_elevators(self,
+                       elevators: List[Elevator],
+                       waiting: Dict[int, List[Person]],
+                       max_floor: int) -> List[algorithms.Direction]:
+        """Return the directions chosen by self.driver, or by self.algorithm
+        if there is no driver.
+
+        Raise an AssertionError if self.reference chooses differently from
+        self.algorithm.
+        """
+        directions = self.algorithm.move_elevators(elevators, waiting,
+                                                   max_floor)
+        expected = self.reference.move_elevators(elevators, waiting,
+                                                 max_floor)
+        assert directions == expected, \
+            f'{type(self.algorithm).__name__} differs in round {self.rounds}'
+        self.rounds += 1
+        if self.driver is not None:
+            return self.driver.move_elevators(elevators, waiting, max_floor)
+        return directions
+
+
+class _RoundTimer(Visualizer):
+    """A visualizer that shows nothing, and times each round of the
+    simulation from the round header until the end-of-round wait.
+    """
+    times: List[float]
+    # === Private Attributes ===
+    # _start: the time the current round started
+    _start: float
+
+    def __init__(self, sim: Simulation) -> None:
+        """Initialize a timer for the rounds of <sim>."""
+        Visualizer.__init__(self, sim.elevators, sim.num_floors, False)
+        self.times = []
+        self._start = 0.0
+
+    def render_header(self, round_num: int) -> None:
+        """Record the start of a round."""
+        self._start = time.perf_counter()
+
+    def wait(self, wait_time: int) -> None:
+        """Record the end of a round."""
+        self.times.append(time.perf_counter() - self._start)
+
+
+def _crowded_simulation(num_floors: int, num_elevators: int,
+                        num_people: int) -> Simulation:
+    """Return a simulation that has <num_people> people arriving in round 0.
+    """
+    return Simulation({
+        'num_floors': num_floors,
+        'floor_height': 10,
+        'num_elevators': num_elevators,
+        'elevator_capacity': 10,
+        'num_people_per_round': None,
+        'arrival_generator': _Crowd(num_floors, num_people),
+        'moving_algorithm': algorithms.ShortSighted(),
+        'visualize': False
+    })
+
+
+class _PlainWaiter:
+    """A stand-in for a person whose wait time is a plain int attribute, as
+    before wait times were measured against a shared clock.
+    """
+    wait_time: int
+
+    def __init__(self) -> None:
+        """Initialize a waiter who has not waited yet."""
+        self.wait_time = 0
+
+
+def bench_aging(num_people: int = 100000, num_rounds: int = 100) -> None:
+    """Time how long it takes to age everyone in the building by one round.
+
+    This compares ticking a shared clock and updating its WaitHistogram with
+    incrementing a plain int wait time on every person, and also reports how
+    long a whole simulation round takes with that many people waiting.
+    """
+    random.seed(148)
+    clock = RoundClock()
+    histogram = WaitHistogram(clock)
+    for _ in range(num_people):
+        person = Person(1, 2)
+        person.start_waiting(clock)
+        histogram.arrive(person)
+
+    start = time.perf_counter()
+    for _ in range(num_rounds):
+        clock.tick()
+        histogram.age()
+    clock_time = (time.perf_counter() - start) / num_rounds
+
+    waiters = [_PlainWaiter() for _ in range(num_people)]
+    start = time.perf_counter()
+    for _ in range(num_rounds):
+        for waiter in waiters:
+            waiter.wait_time += 1
+    loop_time = (time.perf_counter() - start) / num_rounds
+
+    # Round 0 is left out, since it is spent creating everyone.
+    sim = _crowded_simulation(20, 8, num_people)
+    timer = _RoundTimer(sim)
+    sim.visualizer = timer
+    random.seed(148)
+    sim.run(1 + num_rounds)
+    round_time = sum(timer.times[1:]) / num_rounds
+
+    print(f'aging {num_people} people, per round:')
+    print(f'  shared clock:            {clock_time * 1e6:10.2f} us')
+    print(f'  plain int increment:     {loop_time * 1e6:10.2f} us')
+    print(f'  whole simulation round:  {round_time * 1e6:10.2f} us')
+
+
+def _busy_config(num_floors: int, num_elevators: int,
+                 moving_algorithm: algorithms.MovingAlgorithm
+                 ) -> Dict[str, Any]:
+    """Return a config for a building with 5 random arrivals per round."""
+    return {
+        'num_floors': num_floors,
+        'floor_height': 10,
+        'num_elevators': num_elevators,
+        'elevator_capacity': 10,
+        'num_people_per_round': 5,
+        'arrival_generator': algorithms.RandomArrivals(num_floors, 5),
+        'moving_algorithm': moving_algorithm,
+        'visualize': False
+    }
+
+
+def check_moving(num_rounds: int = 300) -> None:
+    """Check that PushyPassenger and ShortSighted make the same decisions as
+    their reference implementations, over seeded simulation runs.
+
+    ShortSighted only keeps its cached targets while elevators move towards
+    them, so the runs use both the default travel model and fast ones where
+    elevators cross several floors per round. Some runs have the elevators
+    driven by RandomAlgorithm instead, so that they also move away from the
+    cached targets.
+    """
+    runs = [(1, None, False), (2, 30, False), (3, 60, False),
+            (4, None, True), (5, 60, True)]
+    for algorithm_class, reference_class in _REFERENCES:
+        for seed, speed, random_driver in runs:
+            random.seed(seed)
+            driver = algorithms.RandomAlgorithm() if random_driver else None
+            config = _busy_config(30, 8, _ComparedMoves(algorithm_class(),
+                                                        reference_class(),
+                                                        driver))
+            if speed is not None:
+                config['max_speed'] = speed
+                config['acceleration'] = 10
+            Simulation(config).run(num_rounds)
+    print('cached moving decisions match the reference implementations')
+
+
+def bench_moving(num_elevators: int = 64, num_floors: int = 40,
+                 num_rounds: int = 500) -> None:
+    """Time one call to move_elevators per round, in a busy building.
+
+    Each algorithm is compared with its reference implementation, which
+    recomputes every decision from scratch.
+    """
+    print(f'move_elevators with {num_elevators} elevators, '
+          f'{num_floors} floors, mean per round:')
+    for algorithm_class, reference_class in _REFERENCES:
+        for algorithm, label in [(algorithm_class(), 'cached'),
+                                 (reference_class(), 'reference')]:
+            random.seed(148)
+            timer = _TimedMoves(algorithm)
+            Simulation(_busy_config(num_floors, num_elevators,
+                                    timer)).run(num_rounds)
+            mean = sum(timer.times) / len(timer.times)
+            print(f'  {algorithm_class.__name__:>14} {label:>9}: '
+                  f'{mean * 1e6:10.2f} us')
+
+
+if __name__ == '__main__':
+    check_moving()
+    bench_aging()
+    bench_moving()
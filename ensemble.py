@@ -0,0 +1,194 @@
+"""CSC148 Assignment 1 - Ensemble Statistics
+
+=== CSC148 Fall 2018 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module description ===
+This module runs many seeded replicas of one simulation config across worker
+processes, and merges their statistics into means with confidence intervals.
+
+A single run with random arrivals or a random moving algorithm gives noisy
+statistics. Rather than fixing the number of replicas up front, run_ensemble
+adds them in batches of one per worker, and stops as soon as the confidence
+interval of every tracked statistic is narrow enough.
+
+The wait times reported by a run where nobody completed a trip are -1, which
+is not a real wait time. Those replicas are left out of the wait time
+statistics, and counted separately instead. The avg_time reported by a run
+is rounded down, so each replica's exact average is used in its place.
+"""
+from math import sqrt
+import os
+import random
+from statistics import NormalDist, mean, stdev
+from typing import Any, Dict, List, Optional, Tuple
+
+import algorithms
+from simulation import Simulation
+from workers import worker_pool
+
+
+# The statistics that are only meaningful if someone completed a trip.
+TIME_KEYS = ('max_time', 'min_time', 'avg_time')
+
+
+def _run_replica(task: Tuple[Dict[str, Any], int, int]) -> Dict[str, float]:
+    """Return the numeric statistics of one seeded run of a simulation.
+
+    <task> is the simulation config, the random seed and the number of
+    rounds. The statistics in TIME_KEYS are left out if nobody completed a
+    trip. Otherwise, avg_time is the exact average, not rounded down.
+    """
+    config, seed, num_rounds = task
+    random.seed(seed)
+    stats = Simulation(dict(config, visualize=False)).run(num_rounds)
+    if stats['people_completed'] > 0:
+        stats['avg_time'] = stats['total_time'] / stats['people_completed']
+    return {key: value for key, value in stats.items()
+            if isinstance(value, (int, float)) and
+            (stats['people_completed'] > 0 or key not in TIME_KEYS)}
+
+
+def _t_quantile(p: float, df: int) -> float:
+    """Return the <p> quantile of Student's t distribution with <df> degrees
+    of freedom.
+
+    This uses the Cornish-Fisher expansion around the normal quantile. Once
+    df >= 7, it is within 0.002 of the exact quantile for p = 0.975 and
+    within 0.006 for p = 0.995; it is less accurate for smaller df.
+
+    Preconditions:
+        0.0 < p < 1.0
+        df >= 1
+    """
+    z = NormalDist().inv_cdf(p)
+    return (z +
+            (z ** 3 + z) / (4 * df) +
+            (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2) +
+            (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) /
+            (384 * df ** 3))
+
+
+def summarize(values: List[float],
+              confidence: float = 0.95) -> Dict[str, float]:
+    """Return the mean of <values>, and the bounds and half-width of its
+    <confidence> confidence interval.
+
+    Preconditions:
+        len(values) >= 2
+        0.0 < confidence < 1.0
+    """
+    centre = mean(values)
+    half_width = (_t_quantile((1 + confidence) / 2, len(values) - 1) *
+                  stdev(values) / sqrt(len(values)))
+    return {
+        'mean': centre,
+        'low': centre - half_width,
+        'high': centre + half_width,
+        'half_width': half_width
+    }
+
+
+def run_ensemble(config: Dict[str, Any],
+                 num_rounds: int,
+                 keys: Tuple[str, ...] = ('avg_time', 'max_time'),
+                 relative_error: float = 0.05,
+                 confidence: float = 0.95,
+                 min_replicas: int = 8,
+                 max_replicas: int = 1000,
+                 processes: Optional[int] = None,
+                 seed: int = 0) -> Dict[str, Any]:
+    """Run seeded replicas of the simulation described by <config>, and
+    return their merged statistics.
+
+    Replica i runs <num_rounds> rounds with random seed <seed> + i. Replicas
+    are added one batch at a time, one per worker process, until there are
+    at least <min_replicas> and the <confidence> confidence interval for
+    every statistic in <keys> has a half-width of at most <relative_error>
+    times its mean, or until there are <max_replicas>.
+
+    Each statistic is only taken from the replicas that report it, and is
+    only precise enough once at least <min_replicas> of them do. Replicas
+    where nobody completed a trip do not report the statistics in TIME_KEYS.
+
+    The returned dictionary maps 'num_replicas' to the number of replicas
+    run, 'replicas_without_completions' to the number of them where nobody
+    completed a trip, and each numeric statistic reported by Simulation.run
+    to the result of summarize for it, or None if fewer than <min_replicas>
+    replicas report it. The avg_time of each replica is its exact average,
+    rather than the rounded down one reported by Simulation.run.
+
+    <processes> is the number of worker processes, or None to use every CPU.
+
+    Preconditions:
+        num_rounds >= 1
+        every key in <keys> is a numeric statistic reported by Simulation.run
+        relative_error > 0.0
+        0.0 < confidence < 1.0
+        8 <= min_replicas <= max_replicas
+    """
+    batch_size = processes or os.cpu_count() or 1
+    results = []
+    with worker_pool(processes) as pool:
+        while len(results) < max_replicas:
+            size = min(max(batch_size, min_replicas - len(results)),
+                       max_replicas - len(results))
+            tasks = [(config, seed + i, num_rounds)
+                     for i in range(len(results), len(results) + size)]
+            results.extend(pool.map(_run_replica, tasks))
+
+            if all(_is_precise(_reported(results, key), confidence,
+                               relative_error, min_replicas)
+                   for key in keys):
+                break
+
+    merged = {
+        'num_replicas': len(results),
+        'replicas_without_completions': sum(
+            stats['people_completed'] == 0 for stats in results)
+    }
+    for key in dict.fromkeys(list(max(results, key=len)) + list(TIME_KEYS)):
+        values = _reported(results, key)
+        merged[key] = summarize(values, confidence) \
+            if len(values) >= min_replicas else None
+    return merged
+
+
+def _reported(results: List[Dict[str, float]], key: str) -> List[float]:
+    """Return the value of <key> in each replica of <results> that reports
+    it.
+    """
+    return [stats[key] for stats in results if key in stats]
+
+
+def _is_precise(values: List[float], confidence: float,
+                relative_error: float, min_replicas: int) -> bool:
+    """Return whether there are at least <min_replicas> <values>, and the
+    <confidence> confidence interval for their mean has a half-width of at
+    most <relative_error> times the mean.
+    """
+    if len(values) < min_replicas:
+        return False
+    summary = summarize(values, confidence)
+    return summary['half_width'] <= relative_error * abs(summary['mean'])
+
+
+def sample_ensemble() -> Dict[str, Any]:
+    """Run an ensemble of the sample simulation, and return its statistics.
+    """
+    config = {
+        'num_floors': 6,
+        'floor_height': 10,
+        'num_elevators': 6,
+        'elevator_capacity': 3,
+        'num_people_per_round': 2,
+        'arrival_generator': algorithms.RandomArrivals(6, 2),
+        'moving_algorithm': algorithms.RandomAlgorithm(),
+        'visualize': False
+    }
+    return run_ensemble(config, 15)
+
+
+if __name__ == '__main__':
+    print(sample_ensemble())
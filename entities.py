@@ -15,6 +15,10 @@ methods we have provided. However, you can (and should) add new attributes,
 and of course you'll have to implement the methods we've provided, as well
 as add your own methods to complete this assignment.
 
+This module also contains WaitHistogram, which keeps running totals of how
+long the people in a simulation have been waiting, so that statistics like
+the number of people at each anger level never need to walk every person.
+
 Finally, note that Person and Elevator each inherit from a kind of sprite found
 in sprites.py; this is to enable their instances to be visualized properly.
 You may not change sprites.py, but are responsible for reading the documentation
@@ -22,10 +26,61 @@ to understand these classes, as well as the abstract methods your classes must
 implement.
 """
 from __future__ import annotations
-from typing import List
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional
 from sprites import PersonSprite, ElevatorSprite
 
 
+# The wait times (in rounds) at which a person moves up to the next anger
+# level. Level i covers wait times in [ANGER_THRESHOLDS[i - 1],
+# ANGER_THRESHOLDS[i]).
+ANGER_THRESHOLDS = [3, 5, 7, 9]
+
+# The number of distinct anger levels.
+NUM_ANGER_LEVELS = len(ANGER_THRESHOLDS) + 1
+
+# The scaled sprite image for each anger level, loaded on first use.
+_IMAGES: Dict[int, Any] = {}
+
+
+def anger_level(wait_time: int) -> int:
+    """Return the anger level of a person who has waited <wait_time> rounds.
+
+    Precondition: wait_time >= 0
+
+    >>> anger_level(0)
+    0
+    >>> anger_level(4)
+    1
+    >>> anger_level(100)
+    4
+    """
+    return bisect_right(ANGER_THRESHOLDS, wait_time)
+
+
+class RoundClock:
+    """A counter of the rounds that have passed in a simulation.
+
+    People who are waiting or riding measure their wait time against a shared
+    clock, so advancing the clock ages all of them at once.
+
+    === Attributes ===
+    round: the number of rounds that have passed
+
+    === Representation invariants ===
+    round >= 0
+    """
+    round: int
+
+    def __init__(self) -> None:
+        """Initialize a new clock at round 0."""
+        self.round = 0
+
+    def tick(self) -> None:
+        """Advance this clock by one round."""
+        self.round += 1
+
+
 class Elevator(ElevatorSprite):
     """An elevator in the elevator simulation.
 
@@ -34,10 +89,44 @@ class Elevator(ElevatorSprite):
 
     === Attributes ===
     passengers: A list of the people currently on this elevator
+    capacity: the maximum number of people that can be on this elevator
+    current_floor: the floor this elevator is currently on
+    velocity: the speed this elevator is travelling at, in metres per round;
+              positive when going up, negative when going down, and 0.0 when
+              stopped at current_floor
 
     === Representation invariants ===
+    capacity >= 1
+    0 <= len(passengers) <= capacity
+    current_floor >= 1
     """
     passengers: List[Person]
+    capacity: int
+    current_floor: int
+    velocity: float
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize a new empty elevator on floor 1.
+
+        Precondition: capacity >= 1
+        """
+        ElevatorSprite.__init__(self)
+        self.passengers = []
+        self.capacity = capacity
+        self.current_floor = 1
+        self.velocity = 0.0
+
+    def fullness(self) -> float:
+        """Return the fraction that this elevator is filled.
+
+        The value returned is a float between 0.0 (completely empty) and
+        1.0 (completely full).
+        """
+        return len(self.passengers) / self.capacity
+
+    def is_full(self) -> bool:
+        """Return whether this elevator is at capacity."""
+        return len(self.passengers) >= self.capacity
 
 
 class Person(PersonSprite):
@@ -57,6 +146,67 @@ class Person(PersonSprite):
     target: int
     wait_time: int
 
+    # === Private Attributes ===
+    # _clock: the clock this person's wait is measured against, or None if
+    #         they are not currently waiting
+    # _wait_base: if _clock is None, the wait time itself; otherwise the
+    #             clock round at which this person's wait time was 0
+    _clock: Optional[RoundClock]
+    _wait_base: int
+
+    def __init__(self, start: int, target: int) -> None:
+        """Initialize a new person who has not waited yet.
+
+        Preconditions:
+            start >= 1
+            target >= 1
+        """
+        self.start = start
+        self.target = target
+        self._clock = None
+        self._wait_base = 0
+        # The sprite initializer loads an image based on the anger level,
+        # so the wait time must be set first.
+        PersonSprite.__init__(self)
+
+    @property
+    def wait_time(self) -> int:
+        """Return the number of rounds this person has been waiting."""
+        if self._clock is None:
+            return self._wait_base
+        return self._clock.round - self._wait_base
+
+    @wait_time.setter
+    def wait_time(self, value: int) -> None:
+        """Set the number of rounds this person has been waiting."""
+        if self._clock is None:
+            self._wait_base = value
+        else:
+            self._wait_base = self._clock.round - value
+
+    def start_waiting(self, clock: RoundClock) -> None:
+        """Start measuring this person's wait time against <clock>.
+
+        From now on, every tick of <clock> adds one round to wait_time.
+        """
+        self._wait_base = clock.round - self.wait_time
+        self._clock = clock
+
+    def stop_waiting(self) -> None:
+        """Stop this person's wait time from increasing any further."""
+        self._wait_base = self.wait_time
+        self._clock = None
+
+    def load_image(self) -> Any:
+        """Return the image for this person's current anger level.
+
+        The images are loaded once per anger level and shared by everyone.
+        """
+        level = self.get_anger_level()
+        if level not in _IMAGES:
+            _IMAGES[level] = PersonSprite.load_image(self)
+        return _IMAGES[level]
+
     def get_anger_level(self) -> int:
         """Return this person's anger level.
 
@@ -68,12 +218,132 @@ class Person(PersonSprite):
             - Level 3: waiting 7-8 rounds
             - Level 4: waiting >= 9 rounds
         """
-        pass
+        return anger_level(self.wait_time)
+
+
+class WaitHistogram:
+    """Running wait-time statistics for the people in a simulation.
+
+    People are "active" from the round they arrive until the round they leave
+    their elevator. Boarding an elevator does not change anything here, since
+    passengers keep accumulating wait time until they reach their target.
+
+    === Attributes ===
+    anger_counts: anger_counts[i] is the number of active people at anger
+                  level i
+    clock: the clock that active people measure their wait time against
+    completed: maps a wait time to the number of people who reached their
+               target floor after waiting that long
+
+    === Representation invariants ===
+    len(anger_counts) == NUM_ANGER_LEVELS
+    every count in completed is >= 1
+    """
+    anger_counts: List[int]
+    clock: RoundClock
+    completed: Dict[int, int]
+
+    # === Private Attributes ===
+    # _active: maps a clock round to the number of active people whose wait
+    #          time was 0 at that round
+    #
+    # === Private Representation invariants ===
+    # sum(anger_counts) == sum(_active.values())
+    # every count in _active is >= 1
+    _active: Dict[int, int]
+
+    def __init__(self, clock: RoundClock) -> None:
+        """Initialize an empty histogram for people waiting on <clock>."""
+        self.anger_counts = [0] * NUM_ANGER_LEVELS
+        self.clock = clock
+        self.completed = {}
+        self._active = {}
+
+    def arrive(self, person: Person) -> None:
+        """Record that <person> has entered the simulation."""
+        _add(self._active, self.clock.round - person.wait_time, 1)
+        self.anger_counts[anger_level(person.wait_time)] += 1
+
+    def age(self) -> None:
+        """Record that self.clock has just ticked.
+
+        Only the people whose wait time just reached one of the anger
+        thresholds change level, so the counters are updated once per level.
+        """
+        for level, threshold in enumerate(ANGER_THRESHOLDS):
+            crossed = self._active.get(self.clock.round - threshold, 0)
+            self.anger_counts[level] -= crossed
+            self.anger_counts[level + 1] += crossed
+
+    def leave(self, person: Person) -> None:
+        """Record that <person> has reached their target floor.
+
+        Precondition: <person> was previously passed to self.arrive and has
+        not left yet.
+        """
+        _add(self._active, self.clock.round - person.wait_time, -1)
+        self.anger_counts[anger_level(person.wait_time)] -= 1
+        _add(self.completed, person.wait_time, 1)
+
+    def active(self) -> Dict[int, int]:
+        """Return a dictionary mapping each wait time to the number of active
+        people who have been waiting that long.
+        """
+        return {self.clock.round - base: count
+                for base, count in sorted(self._active.items(), reverse=True)}
+
+    def num_active(self) -> int:
+        """Return the number of people still waiting or riding."""
+        return sum(self.anger_counts)
+
+    def num_completed(self) -> int:
+        """Return the number of people who have reached their target."""
+        return sum(self.completed.values())
+
+    def completed_times(self) -> Dict[str, int]:
+        """Return the max, min and average wait of the completed people, and
+        the exact total of their waits.
+
+        The average is rounded down. The max, min and average are -1, and the
+        total is 0, if nobody has completed their trip yet.
+        """
+        total = self.num_completed()
+        waited = sum(wait * count for wait, count in self.completed.items())
+        if total == 0:
+            return {'max_time': -1, 'min_time': -1, 'avg_time': -1,
+                    'total_time': 0}
+        return {
+            'max_time': max(self.completed),
+            'min_time': min(self.completed),
+            'avg_time': waited // total,
+            'total_time': waited
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the current anger level counts and active wait-time
+        histogram, suitable for storing.
+        """
+        return {
+            'anger_levels': list(self.anger_counts),
+            'wait_histogram': self.active()
+        }
+
+
+def _add(histogram: Dict[int, int], key: int, delta: int) -> None:
+    """Add <delta> to the count stored under <key> in <histogram>.
+
+    Keys whose count drops to zero are removed.
+    """
+    count = histogram.get(key, 0) + delta
+    if count == 0:
+        del histogram[key]
+    else:
+        histogram[key] = count
 
 
 if __name__ == '__main__':
     import python_ta
     python_ta.check_all(config={
-        'extra-imports': ['sprites'],
+        'extra-imports': ['sprites', 'bisect'],
         'max-nested-blocks': 4
     })
@@ -0,0 +1,152 @@
+"""CSC148 Assignment 1 - Shared Arrivals
+
+=== CSC148 Fall 2018 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module description ===
+This module lets many worker processes replay the same arrivals file without
+each of them reading and storing its own copy.
+
+shared_arrivals reads the file once and stores its decoded arrivals in a
+block of shared memory. SharedFileArrivals generates the same arrivals as
+FileArrivals, but reads them straight out of that block. When it is sent to
+a worker process, only the name of the block is sent; the worker attaches to
+the block rather than copying it.
+
+The block holds a count n followed by three columns of n 32-bit ints: the
+round, start floor and target floor of each person, sorted by round.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Iterator, List, Optional
+
+from algorithms import ArrivalGenerator, read_arrivals
+from entities import Person
+
+
+@contextmanager
+def shared_arrivals(filename: str) -> Iterator[str]:
+    """Return a context manager that stores the arrivals listed in the CSV
+    file <filename> in shared memory, and gives the name of the block.
+
+    The block is freed when the context manager exits, so every
+    SharedFileArrivals using it must be finished by then.
+
+    Precondition:
+        <filename> refers to a valid CSV file, following the specified
+        format and restrictions from the assignment handout.
+    """
+    columns = [array('i'), array('i'), array('i')]
+    for round_num, pairs in sorted(read_arrivals(filename).items()):
+        for start, target in pairs:
+            columns[0].append(round_num)
+            columns[1].append(start)
+            columns[2].append(target)
+
+    data = array('i', [len(columns[0])])
+    for column in columns:
+        data.extend(column)
+    block = SharedMemory(create=True, size=data.itemsize * len(data))
+    try:
+        block.buf[:len(data) * data.itemsize] = data.tobytes()
+        yield block.name
+    finally:
+        block.close()
+        block.unlink()
+
+
+class SharedFileArrivals(ArrivalGenerator):
+    """Generate arrivals from a block of shared memory made by
+    shared_arrivals.
+
+    This generates exactly the same arrivals as a FileArrivals for the same
+    file.
+    """
+    # === Private Attributes ===
+    # _name: the name of the shared memory block
+    # _block: the shared memory block, or None once closed
+    # _rounds: the round column of the block
+    # _starts: the start floor column of the block
+    # _targets: the target floor column of the block
+    _name: str
+    _block: Optional[SharedMemory]
+    _rounds: memoryview
+    _starts: memoryview
+    _targets: memoryview
+
+    def __init__(self, max_floor: int, name: str) -> None:
+        """Initialize a new SharedFileArrivals reading the block <name>.
+
+        The num_people attribute is set to None, as for FileArrivals.
+
+        Precondition: <name> is the name given by a shared_arrivals context
+        manager that has not exited yet.
+        """
+        ArrivalGenerator.__init__(self, max_floor, None)
+        self._name = name
+        self._attach()
+
+    def _attach(self) -> None:
+        """Attach to the shared memory block, and view its columns."""
+        # Set first, so that close still works if attaching fails.
+        self._block = None
+        self._block = SharedMemory(name=self._name)
+        ints = self._block.buf.cast('i')
+        n = ints[0]
+        self._rounds = ints[1:n + 1]
+        self._starts = ints[n + 1:2 * n + 1]
+        self._targets = ints[2 * n + 1:3 * n + 1]
+
+    def generate(self, round_num: int) -> Dict[int, List[Person]]:
+        """Return the people listed in the file for the given round."""
+        arrivals = {}
+        low = bisect_left(self._rounds, round_num)
+        high = bisect_right(self._rounds, round_num, low)
+        for i in range(low, high):
+            start = self._starts[i]
+            arrivals.setdefault(start, []).append(
+                Person(start, self._targets[i]))
+        return arrivals
+
+    def close(self) -> None:
+        """Detach from the shared memory block.
+
+        This generator cannot be used after it is closed.
+        """
+        if self._block is not None:
+            for view in (self._rounds, self._starts, self._targets):
+                view.release()
+            self._block.close()
+            self._block = None
+
+    def __del__(self) -> None:
+        """Detach from the shared memory block when this generator is
+        deleted; the block cannot be closed while the column views exist.
+        """
+        if hasattr(self, '_block'):
+            self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Return the state to send to another process: everything except
+        the block itself, which the other process attaches to by name.
+        """
+        return {'max_floor': self.max_floor,
+                'num_people': self.num_people,
+                '_name': self._name}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore this generator in another process, from <state>."""
+        self.__dict__.update(state)
+        self._attach()
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config={
+        'extra-imports': ['algorithms', 'entities', 'array', 'bisect',
+                          'contextlib', 'multiprocessing.shared_memory'],
+        'max-nested-blocks': 4
+    })
@@ -20,7 +20,7 @@ from typing import Dict, List, Any
 
 import algorithms
 from algorithms import Direction
-from entities import Person, Elevator
+from entities import Person, Elevator, RoundClock, WaitHistogram
 from visualizer import Visualizer
 
 
@@ -32,6 +32,10 @@ class Simulation:
     elevators: a list of the elevators in the simulation
     moving_algorithm: the algorithm used to decide how to move elevators
     num_floors: the number of floors
+    travel_model: decides how many floors each elevator moves in a round
+    snapshots: one entry per round of the most recent run, recording the
+               number of people still in the building at each anger level
+               at the end of that round
     visualizer: the Pygame visualizer used to visualize this simulation
     waiting: a dictionary of people waiting for an elevator
              (keys are floor numbers, values are the list of waiting people)
@@ -40,18 +44,55 @@ class Simulation:
     elevators: List[Elevator]
     moving_algorithm: algorithms.MovingAlgorithm
     num_floors: int
+    snapshots: List[Dict[str, Any]]
+    travel_model: algorithms.TravelModel
     visualizer: Visualizer
     waiting: Dict[int, List[Person]]
 
+    # === Private Attributes ===
+    # _clock: counts the rounds of the current run; everyone waiting or
+    #         riding measures their wait time against it
+    # _elevator_capacity: the capacity of every elevator
+    # _num_iterations: the number of rounds completed in the current run
+    # _total_people: the number of people who arrived in the current run
+    # _wait_stats: running wait-time statistics for the current run
+    _clock: RoundClock
+    _elevator_capacity: int
+    _num_iterations: int
+    _total_people: int
+    _wait_stats: WaitHistogram
+
     def __init__(self,
                  config: Dict[str, Any]) -> None:
-        """Initialize a new simulation using the given configuration."""
+        """Initialize a new simulation using the given configuration.
+
+        Besides the keys used in sample_run, <config> may contain 'max_speed'
+        (metres per round) and 'acceleration' (metres per round per round),
+        which together with 'floor_height' set how far elevators travel each
+        round. Without them, elevators move one floor per round.
+        """
+        self.arrival_generator = config['arrival_generator']
+        self.moving_algorithm = config['moving_algorithm']
+        self.num_floors = config['num_floors']
+        self.travel_model = algorithms.TravelModel(config['floor_height'],
+                                                   config.get('max_speed'),
+                                                   config.get('acceleration'))
+        self._elevator_capacity = config['elevator_capacity']
+        self.elevators = [Elevator(self._elevator_capacity)
+                          for _ in range(config['num_elevators'])]
+        self.waiting = {floor: [] for floor in range(1, self.num_floors + 1)}
+        self.snapshots = []
+
+        self._num_iterations = 0
+        self._total_people = 0
+        self._clock = RoundClock()
+        self._wait_stats = WaitHistogram(self._clock)
 
         # Initialize the visualizer.
         # Note that this should be called *after* the other attributes
         # have been initialized.
-        self.visualizer = Visualizer([],  # should be self.elevators
-                                     2,   # should be self.num_floors
+        self.visualizer = Visualizer(self.elevators,
+                                     self.num_floors,
                                      config['visualize'])
 
     ############################################################################
@@ -68,6 +109,7 @@ class Simulation:
         Note: each run of the simulation starts from the same initial state
         (no people, all elevators are empty and start at floor 1).
         """
+        self._reset()
         for i in range(num_rounds):
             self.visualizer.render_header(i)
 
@@ -83,47 +125,123 @@ class Simulation:
             # Stage 4: move the elevators using the moving algorithm
             self._move_elevators()
 
+            # Everyone still in the building has now waited another round
+            self._age_people()
+            self._num_iterations += 1
+            self.snapshots.append(self._snapshot(i))
+
             # Pause for 1 second
             self.visualizer.wait(1)
 
         return self._calculate_stats()
 
+    def _reset(self) -> None:
+        """Return this simulation to its initial state."""
+        for elevator in self.elevators:
+            elevator.passengers = []
+            elevator.current_floor = 1
+            elevator.velocity = 0.0
+        self.waiting = {floor: [] for floor in range(1, self.num_floors + 1)}
+        self.snapshots = []
+        self._num_iterations = 0
+        self._total_people = 0
+        self._clock = RoundClock()
+        self._wait_stats = WaitHistogram(self._clock)
+
     def _generate_arrivals(self, round_num: int) -> None:
         """Generate and visualize new arrivals."""
-        pass
+        arrivals = self.arrival_generator.generate(round_num)
+        for floor, people in arrivals.items():
+            self.waiting[floor].extend(people)
+            for person in people:
+                person.start_waiting(self._clock)
+                self._wait_stats.arrive(person)
+            self._total_people += len(people)
+        self.visualizer.show_arrivals(arrivals)
 
     def _handle_leaving(self) -> None:
         """Handle people leaving elevators."""
-        pass
+        for elevator in self.elevators:
+            staying = []
+            for person in elevator.passengers:
+                if person.target == elevator.current_floor:
+                    self._wait_stats.leave(person)
+                    person.stop_waiting()
+                    self.visualizer.show_disembarking(person, elevator)
+                else:
+                    staying.append(person)
+            elevator.passengers = staying
 
     def _handle_boarding(self) -> None:
         """Handle boarding of people and visualize."""
-        pass
+        for elevator in self.elevators:
+            queue = self.waiting[elevator.current_floor]
+            while queue and not elevator.is_full():
+                person = queue.pop(0)
+                elevator.passengers.append(person)
+                self.visualizer.show_boarding(person, elevator)
 
     def _move_elevators(self) -> None:
         """Move the elevators in this simulation.
 
-        Use this simulation's moving algorithm to move the elevators.
+        Use this simulation's moving algorithm to choose their directions,
+        and its travel model to decide how far they go.
         """
-        pass
+        directions = self.moving_algorithm.move_elevators(self.elevators,
+                                                          self.waiting,
+                                                          self.num_floors)
+        waiting_floors = sorted(floor for floor, people in self.waiting.items()
+                                if people)
+        distances = [self.travel_model.travel(elevator, direction,
+                                              waiting_floors, self.num_floors)
+                     for elevator, direction in zip(self.elevators, directions)]
+        self.visualizer.show_elevator_moves(self.elevators, directions,
+                                            distances)
+
+    def _age_people(self) -> None:
+        """Increase the wait time of everyone waiting or riding by one round.
+
+        Everyone in the building measures their wait time against the same
+        clock, so this takes constant time no matter how many people there
+        are.
+        """
+        self._clock.tick()
+        self._wait_stats.age()
+
+    def _snapshot(self, round_num: int) -> Dict[str, Any]:
+        """Return a record of the anger level counts at the end of the given
+        round.
+
+        Only the counts are recorded, so this takes time proportional to the
+        number of anger levels. The full wait-time histogram is reported by
+        _calculate_stats at the end of the run.
+        """
+        return {'round': round_num,
+                'anger_levels': list(self._wait_stats.anger_counts)}
 
     ############################################################################
     # Statistics calculations
     ############################################################################
-    def _calculate_stats(self) -> Dict[str, int]:
+    def _calculate_stats(self) -> Dict[str, Any]:
         """Report the statistics for the current run of this simulation.
+
+        Besides the statistics from the assignment handout, this includes the
+        exact total wait of the people who completed their trips, the
+        number of people still in the building at each anger level, and a
+        histogram mapping wait time to the number of those people who have
+        waited that long.
         """
-        return {
-            'num_iterations': 0,
-            'total_people': 0,
-            'people_completed': 0,
-            'max_time': 0,
-            'min_time': 0,
-            'avg_time': 0
+        stats = {
+            'num_iterations': self._num_iterations,
+            'total_people': self._total_people,
+            'people_completed': self._wait_stats.num_completed()
         }
+        stats.update(self._wait_stats.completed_times())
+        stats.update(self._wait_stats.snapshot())
+        return stats
 
 
-def sample_run() -> Dict[str, int]:
+def sample_run() -> Dict[str, Any]:
     """Run a sample simulation, and return the simulation statistics."""
     config = {
         'num_floors': 6,
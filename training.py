@@ -0,0 +1,210 @@
+"""CSC148 Assignment 1 - Policy Training
+
+=== CSC148 Fall 2018 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module description ===
+This module fits the table used by algorithms.LearnedPolicy to a particular
+kind of traffic, by simulating many episodes without the visualizer.
+
+Training uses the cross-entropy method. Each generation, a population of
+tables is sampled from a probability distribution over the action for every
+state. Every table is scored on the same seeded episodes, spread across a
+pool of worker processes. The distribution then moves towards the actions
+chosen by the best-scoring tables. At the end, the most likely table is only
+kept if it beats the starting table on a fresh set of episodes.
+
+Trained tables can be saved to and loaded from CSV files, with one line per
+state: the four state values followed by the direction value.
+"""
+import csv
+from itertools import product
+from multiprocessing.pool import Pool
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+import algorithms
+from algorithms import Direction, LearnedPolicy, State
+from simulation import Simulation
+from workers import worker_pool
+
+
+# Every possible elevator state.
+ALL_STATES = list(product(*algorithms.STATE_VALUES))
+
+# The possible actions, in a fixed order.
+ACTIONS = [Direction.UP, Direction.STAY, Direction.DOWN]
+
+
+def episode_cost(stats: Dict[str, Any]) -> float:
+    """Return the average number of rounds waited per person in a run with
+    the given statistics, counting people who are still waiting or riding.
+
+    Lower is better. A run where nobody arrived costs 0.
+    """
+    if stats['total_people'] == 0:
+        return 0.0
+    waited = stats['total_time'] + sum(
+        wait * count for wait, count in stats['wait_histogram'].items())
+    return waited / stats['total_people']
+
+
+def _run_episode(task: Tuple[Dict[str, Any], algorithms.MovingAlgorithm,
+                             int, int]) -> float:
+    """Return the cost of one simulated episode.
+
+    <task> is the simulation config (without a moving algorithm), the moving
+    algorithm to use, the random seed and the number of rounds.
+    """
+    config, moving_algorithm, seed, num_rounds = task
+    random.seed(seed)
+    config = dict(config, moving_algorithm=moving_algorithm, visualize=False)
+    return episode_cost(Simulation(config).run(num_rounds))
+
+
+def evaluate(pool: Pool, config: Dict[str, Any],
+             candidates: List[algorithms.MovingAlgorithm],
+             seeds: List[int], num_rounds: int) -> List[float]:
+    """Return the mean episode cost of each candidate moving algorithm.
+
+    Every candidate is run once for each seed in <seeds>, using the worker
+    processes in <pool>.
+    """
+    tasks = [(config, candidate, seed, num_rounds)
+             for candidate in candidates for seed in seeds]
+    costs = pool.map(_run_episode, tasks)
+    return [sum(costs[i:i + len(seeds)]) / len(seeds)
+            for i in range(0, len(costs), len(seeds))]
+
+
+def train(config: Dict[str, Any],
+          num_rounds: int = 100,
+          generations: int = 20,
+          population: int = 32,
+          num_elite: int = 8,
+          episodes: int = 8,
+          smoothing: float = 0.3,
+          validation_episodes: int = 32,
+          processes: Optional[int] = None,
+          seed: int = 0) -> LearnedPolicy:
+    """Return a LearnedPolicy fitted to the traffic described by <config>.
+
+    <config> is a simulation config as used by Simulation; its moving
+    algorithm and visualize setting are ignored. Each generation samples
+    <population> tables and scores each of them on <episodes> episodes of
+    <num_rounds> rounds. <smoothing> is how far the action probabilities move
+    towards the <num_elite> best tables each generation. <processes> is the
+    number of worker processes, or None to use every CPU.
+
+    The trained table takes the most likely action in each state under the
+    final distribution. It is then compared with the starting table, which
+    always takes default_action, on <validation_episodes> new episodes, and
+    the policy with the lower cost is returned.
+
+    Preconditions:
+        num_rounds >= 1
+        generations >= 1
+        1 <= num_elite <= population
+        episodes >= 1
+        0.0 <= smoothing <= 1.0
+        validation_episodes >= 1
+    """
+    rng = random.Random(seed)
+    config = dict(config)
+    config.pop('moving_algorithm', None)
+
+    # Start with half the probability on the default action for each state.
+    default = {state: algorithms.default_action(state) for state in ALL_STATES}
+    probabilities = {state: [0.5 if action == default[state] else 0.25
+                             for action in ACTIONS]
+                     for state in ALL_STATES}
+
+    with worker_pool(processes) as pool:
+        for _ in range(generations):
+            candidates = [LearnedPolicy(_sample_table(rng, probabilities))
+                          for _ in range(population)]
+            seeds = [rng.randrange(2 ** 32) for _ in range(episodes)]
+            costs = evaluate(pool, config, candidates, seeds, num_rounds)
+
+            ranked = sorted(zip(costs, range(population)))
+            elite = [candidates[i].table for _, i in ranked[:num_elite]]
+            _update(probabilities, elite, smoothing)
+
+        trained = LearnedPolicy({
+            state: ACTIONS[weights.index(max(weights))]
+            for state, weights in probabilities.items()
+        })
+        candidates = [trained, LearnedPolicy(default)]
+        seeds = [rng.randrange(2 ** 32) for _ in range(validation_episodes)]
+        costs = evaluate(pool, config, candidates, seeds, num_rounds)
+
+    return candidates[costs.index(min(costs))]
+
+
+def _sample_table(rng: random.Random,
+                  probabilities: Dict[State, List[float]]
+                  ) -> Dict[State, Direction]:
+    """Return a table with each state's action drawn from <probabilities>.
+    """
+    return {state: rng.choices(ACTIONS, weights)[0]
+            for state, weights in probabilities.items()}
+
+
+def _update(probabilities: Dict[State, List[float]],
+            elite: List[Dict[State, Direction]], smoothing: float) -> None:
+    """Move <probabilities> towards the frequency of each action in <elite>.
+    """
+    for state, weights in probabilities.items():
+        for i, action in enumerate(ACTIONS):
+            frequency = sum(table[state] == action
+                            for table in elite) / len(elite)
+            weights[i] = (1 - smoothing) * weights[i] + smoothing * frequency
+
+
+def save_policy(policy: LearnedPolicy, filename: str) -> None:
+    """Write the table of <policy> to the CSV file <filename>."""
+    with open(filename, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        for state, direction in sorted(policy.table.items()):
+            writer.writerow(list(state) + [direction.value])
+
+
+def load_policy(filename: str) -> LearnedPolicy:
+    """Return the policy saved in the CSV file <filename> by save_policy."""
+    table = {}
+    with open(filename) as csvfile:
+        reader = csv.reader(csvfile)
+        for line in reader:
+            values = [int(value) for value in line]
+            table[tuple(values[:-1])] = Direction(values[-1])
+    return LearnedPolicy(table)
+
+
+def sample_training() -> None:
+    """Train a policy on the sample configuration, compare it with the other
+    moving algorithms, and save it to policy.csv.
+    """
+    config = {
+        'num_floors': 6,
+        'floor_height': 10,
+        'num_elevators': 6,
+        'elevator_capacity': 3,
+        'num_people_per_round': 2,
+        'arrival_generator': algorithms.RandomArrivals(6, 2),
+        'visualize': False
+    }
+    policy = train(config)
+    save_policy(policy, 'policy.csv')
+
+    seeds = list(range(20))
+    candidates = [algorithms.RandomAlgorithm(), algorithms.PushyPassenger(),
+                  algorithms.ShortSighted(), policy]
+    with worker_pool() as pool:
+        costs = evaluate(pool, config, candidates, seeds, 100)
+    for candidate, cost in zip(candidates, costs):
+        print(f'{type(candidate).__name__:>15}: {cost:.2f} rounds per person')
+
+
+if __name__ == '__main__':
+    sample_training()
@@ -16,7 +16,7 @@ and in fact you aren't even submitting this file!
 from __future__ import annotations
 import random
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pygame
 from algorithms import Direction
@@ -164,20 +164,27 @@ class Visualizer:
 
     def show_elevator_moves(self,
                             elevators: List['Elevator'],
-                            directions: List[Direction]) -> None:
-        """Show elevator moves. Note that all the elevators move at once."""
+                            directions: List[Direction],
+                            distances: Optional[List[int]] = None) -> None:
+        """Show elevator moves. Note that all the elevators move at once.
+
+        distances[i] is the number of floors elevators[i] moves; if distances
+        is None, every elevator moves one floor. Moves of several floors are
+        shown in the same 20 frames as single-floor moves.
+        """
         if not self._visualize:
             return
 
-        for _ in range(20):  # Move in 20 seconds
-            for elevator, direction in zip(elevators, directions):
-                if direction == Direction.UP:
-                    step = - FLOOR_HEIGHT / 20
-                elif direction == Direction.DOWN:
-                    step = FLOOR_HEIGHT / 20
-                else:
-                    step = 0
-                elevator.rect.bottom += step
+        if distances is None:
+            distances = [1] * len(elevators)
+
+        start = [elevator.rect.bottom for elevator in elevators]
+        for frame in range(1, 21):  # Move in 20 seconds
+            for i, elevator in enumerate(elevators):
+                offset = -directions[i].value * distances[i] * FLOOR_HEIGHT
+                y = start[i] + offset * frame // 20
+                step = y - elevator.rect.bottom
+                elevator.rect.bottom = y
                 for passenger in elevator.passengers:
                     passenger.rect.bottom += step
 
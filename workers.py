@@ -0,0 +1,42 @@
+"""CSC148 Assignment 1 - Worker Pools
+
+=== CSC148 Fall 2018 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module description ===
+This module contains a helper for running many headless simulations across
+worker processes.
+
+Importing the simulation initializes Pygame, which installs its own handler
+for the termination signal. Worker processes then ignore Pool.terminate,
+which is what a plain "with Pool() as pool:" block calls on exit, and the
+program hangs. The pools here are always shut down by letting their workers
+finish instead.
+"""
+from contextlib import contextmanager
+from multiprocessing.pool import Pool
+from typing import Iterator, Optional
+
+
+@contextmanager
+def worker_pool(processes: Optional[int] = None) -> Iterator[Pool]:
+    """Return a context manager for a pool of <processes> worker processes,
+    or one per CPU if <processes> is None.
+
+    When the block ends, the workers finish their queued tasks and exit.
+    """
+    pool = Pool(processes)
+    try:
+        yield pool
+    finally:
+        pool.close()
+        pool.join()
+
+
+if __name__ == '__main__':
+    import python_ta
+    python_ta.check_all(config={
+        'extra-imports': ['contextlib', 'multiprocessing.pool'],
+        'max-nested-blocks': 4
+    })